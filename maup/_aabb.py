@@ -0,0 +1,16 @@
+"""Vectorized tests on axis-aligned bounding boxes, given as ``(N, 4)`` arrays of
+``(minx, miny, maxx, maxy)`` rows like the ones returned by `shapely.bounds`.
+"""
+
+
+def bbox_contains(outer, inner):
+    """Returns a boolean array telling whether each box in ``outer`` contains the
+    corresponding box in ``inner``. Empty geometries have NaN bounds and are
+    never contained.
+    """
+    return (
+        (outer[:, 0] <= inner[:, 0])
+        & (outer[:, 1] <= inner[:, 1])
+        & (inner[:, 2] <= outer[:, 2])
+        & (inner[:, 3] <= outer[:, 3])
+    )
@@ -0,0 +1,18 @@
+"""Helpers for working with groups of equal labels in sorted arrays."""
+
+import numpy
+
+
+def group_bounds(sorted_labels):
+    """Returns the unique labels of ``sorted_labels``, along with the start and
+    stop positions of the run of each label, in one pass over the array.
+    """
+    sorted_labels = numpy.asarray(sorted_labels)
+    if len(sorted_labels) == 0:
+        empty = numpy.empty(0, dtype=numpy.intp)
+        return sorted_labels, empty, empty
+
+    changes = numpy.flatnonzero(sorted_labels[1:] != sorted_labels[:-1]) + 1
+    starts = numpy.concatenate([[0], changes])
+    stops = numpy.append(changes, len(sorted_labels))
+    return sorted_labels[starts], starts, stops
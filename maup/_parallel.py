@@ -0,0 +1,53 @@
+"""Helpers for spreading vectorized shapely operations over several threads.
+Shapely releases the GIL while GEOS does the work, so threads scale without
+having to pickle any geometries.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+import shapely
+
+from .progress_bar import progress
+
+
+def thread_map(function, items, n_jobs=None, min_items=1_000):
+    """Returns ``[function(item) for item in items]``, computed on ``n_jobs``
+    threads (by default, one per CPU). Fewer than ``min_items`` items are
+    mapped on the calling thread, since the threads would only add overhead.
+    """
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs <= 1 or len(items) < max(min_items, 2):
+        return [function(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        return list(executor.map(function, items))
+
+
+def bulk_intersection(left, right, n_jobs=None, chunksize=10_000):
+    """Returns the intersections of two aligned arrays of geometries, computed
+    in chunks of ``chunksize`` pairs on ``n_jobs`` threads (by default, one per
+    CPU). Inputs no longer than one chunk are intersected on the calling
+    thread, since the threads would only add overhead.
+
+    When `maup.progress` is enabled, the progress bar advances once per chunk.
+    """
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    if len(left) == 0 or (len(left) <= chunksize and not progress.enabled):
+        return shapely.intersection(left, right)
+
+    def intersect_chunk(start):
+        stop = start + chunksize
+        return shapely.intersection(left[start:stop], right[start:stop])
+
+    starts = range(0, len(left), chunksize)
+    if n_jobs <= 1 or len(left) <= chunksize:
+        chunks = map(intersect_chunk, starts)
+        return numpy.concatenate(list(progress(chunks, total=len(starts))))
+
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        chunks = executor.map(intersect_chunk, starts)
+        return numpy.concatenate(list(progress(chunks, total=len(starts))))
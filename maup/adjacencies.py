@@ -1,9 +1,12 @@
 import warnings
 
+import numpy
+import pandas
+import shapely
 from geopandas import GeoSeries
 
 from .indexed_geometries import IndexedGeometries
-from .progress_bar import progress
+from .intersections import intersect_pairs, label_ranks
 
 
 class OverlapWarning(UserWarning):
@@ -14,51 +17,85 @@ class IslandWarning(UserWarning):
     pass
 
 
-def iter_adjacencies(geometries):
+def adjacency_arrays(geometries, n_jobs=None):
+    """Returns the adjacencies between geometries as three aligned arrays: the
+    labels of the first geometry, the labels of the second geometry, and
+    their intersections.
+    """
     indexed = IndexedGeometries(geometries)
-    for i, geometry in progress(indexed.geometries.items(), len(indexed.geometries)):
-        possible = indexed.query(geometry)
-        possible = possible[possible.index > i]
-        inters = possible.intersection(geometry)
-        inters = inters[-(inters.is_empty | inters.isna())]
-        for j, inter in inters.items():
-            yield (i, j), inter
+    geometry_array = indexed._geometry_array
+
+    # Query every geometry against the tree in one bulk call, and keep each
+    # pair only once, with the smaller label first.
+    left, right = indexed.spatial_index.query(geometry_array, predicate="intersects")
+    ranks = label_ranks(indexed.index)
+    keep = ranks[right] > ranks[left]
+    left, right = left[keep], right[keep]
+
+    inters = intersect_pairs(
+        geometry_array[left],
+        geometry_array[right],
+        left_bounds=indexed.bounds_for(left),
+        right_bounds=indexed.bounds_for(right),
+        n_jobs=n_jobs,
+    )
+    nonempty = ~(shapely.is_empty(inters) | shapely.is_missing(inters))
+    left, right, inters = left[nonempty], right[nonempty], inters[nonempty]
+
+    labels = indexed.index.values
+    return labels[left], labels[right], inters
 
 
 def adjacencies(
-    geometries, adjacency_type="rook", *, warn_for_overlaps=True, warn_for_islands=True
+    geometries,
+    adjacency_type="rook",
+    *,
+    warn_for_overlaps=True,
+    warn_for_islands=True,
+    n_jobs=None,
 ):
     """Returns adjacencies between geometries. The return type is a
     `GeoSeries` with a `MultiIndex`, whose (i, j)th entry is the pairwise
     intersection between geometry `i` and geometry `j`. We ensure that
     `i < j` always holds, so that any adjacency is represented just once
     in the series.
+
+    Large numbers of intersections are computed on `n_jobs` threads (by
+    default, one per CPU). Set `n_jobs=1` to use only the calling thread.
     """
     if adjacency_type not in ["rook", "queen"]:
         raise ValueError('adjacency_type must be "rook" or "queen"')
 
-    index, geoms = zip(*iter_adjacencies(geometries))
-    inters = GeoSeries(geoms, index=index, crs=geometries.crs)
+    first, second, geoms = adjacency_arrays(geometries, n_jobs=n_jobs)
 
     if adjacency_type == "rook":
-        inters = inters[inters.length > 0]
+        rook = shapely.length(geoms) > 0
+        first, second, geoms = first[rook], second[rook], geoms[rook]
 
     if warn_for_overlaps:
-        overlaps = inters[inters.area > 0]
-        if len(overlaps) > 0:
+        overlapping = shapely.area(geoms) > 0
+        if overlapping.any():
+            overlaps = zip(first[overlapping].tolist(), second[overlapping].tolist())
             warnings.warn(
                 "Found overlapping polygons while computing adjacencies.\n"
                 "This could be evidence of topological problems.\n"
-                "Indices of overlaps: {}".format(set(overlaps.index)),
+                "Indices of overlaps: {}".format(set(overlaps)),
                 OverlapWarning,
             )
 
     if warn_for_islands:
-        islands = set(geometries.index) - set(i for pair in inters.index for i in pair)
+        # Hash the labels rather than sorting them, since mixed-type labels
+        # can't be sorted.
+        neighbors = pandas.unique(numpy.concatenate([first, second]))
+        islands = geometries.index.difference(neighbors, sort=False)
         if len(islands) > 0:
             warnings.warn(
-                "Found islands.\n" "Indices of islands: {}".format(islands),
+                "Found islands.\n"
+                "Indices of islands: {}".format(set(islands.tolist())),
                 IslandWarning,
             )
 
+    inters = GeoSeries(
+        geoms, index=pandas.MultiIndex.from_arrays([first, second]), crs=geometries.crs
+    )
     return inters
@@ -1,17 +1,24 @@
+import numpy
+import pandas
+
+from ._groups import group_bounds
 from .indexed_geometries import IndexedGeometries
 from .intersections import intersections
 from .crs import require_same_crs
 
 
 @require_same_crs
-def assign(sources, targets):
+def assign(sources, targets, n_jobs=None):
     """Assign source geometries to targets. A source is assigned to the
     target that covers it, or, if no target covers the entire source, the
     target that covers the most of its area.
+
+    Large numbers of intersections are computed on `n_jobs` threads (by
+    default, one per CPU). Set `n_jobs=1` to use only the calling thread.
     """
     assignment = assign_by_covering(sources, targets)
     unassigned = sources[assignment.isna()]
-    assignments_by_area = assign_by_area(unassigned, targets)
+    assignments_by_area = assign_by_area(unassigned, targets, n_jobs=n_jobs)
     assignment.update(assignments_by_area)
     assignment.name = None
     return assignment.astype(targets.index.dtype, errors="ignore")
@@ -22,13 +29,40 @@ def assign_by_covering(sources, targets):
     return indexed_sources.assign(targets)
 
 
-def assign_by_area(sources, targets):
-    return assign_to_max(intersections(sources, targets, area_cutoff=0).area)
+def assign_by_area(sources, targets, n_jobs=None):
+    return assign_to_max(
+        intersections(sources, targets, area_cutoff=0, n_jobs=n_jobs).area
+    )
 
 
 def assign_to_max(weights):
-    return weights.groupby(level="source").idxmax().apply(drop_source_label)
+    source_codes, sources = pandas.factorize(
+        weights.index.get_level_values("source"), sort=True
+    )
+    targets = weights.index.get_level_values("target").values
+
+    firsts = groupwise_argmax(source_codes, weights.to_numpy(dtype=float))
 
+    return pandas.Series(
+        targets[firsts], index=sources[source_codes[firsts]].rename("source")
+    )
+
+
+def groupwise_argmax(codes, values):
+    """Returns the position of the first maximum of ``values`` within each group
+    of equal ``codes``, ordered by code.
+    """
+    if (numpy.diff(codes) >= 0).all() and not numpy.isnan(values).any():
+        # Codes from `intersections` already come sorted, so one pass to find
+        # each group's maximum and one to find where it first occurs will do.
+        _, starts, stops = group_bounds(codes)
+        if len(starts) == 0:
+            return starts
+        maxima = numpy.maximum.reduceat(values, starts)
+        candidates = numpy.flatnonzero(values == numpy.repeat(maxima, stops - starts))
+        return candidates[numpy.flatnonzero(numpy.diff(codes[candidates], prepend=-1))]
 
-def drop_source_label(index):
-    return index[1]
+    # Sort by code and then by decreasing value. The sort is stable, so the
+    # first row of each group is its first maximum, just like idxmax.
+    order = numpy.lexsort((-values, codes))
+    return order[numpy.flatnonzero(numpy.diff(codes[order], prepend=-1))]
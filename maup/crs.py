@@ -5,10 +5,12 @@ def require_same_crs(f):
     @wraps(f)
     def wrapped(*args, **kwargs):
         geoms1, geoms2, *rest = args
-        if not geoms1.crs == geoms2.crs:
+        crs1, crs2 = geoms1.crs, geoms2.crs
+        # Comparing CRS objects is expensive, so check identity first
+        if crs1 is not crs2 and not crs1 == crs2:
             raise TypeError(
                 "the source and target geometries must have the same CRS. {} {}".format(
-                    geoms1.crs, geoms2.crs
+                    crs1, crs2
                 )
             )
         return f(*args, **kwargs)
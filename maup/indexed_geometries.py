@@ -1,6 +1,9 @@
+import numpy
 import pandas
-from shapely.prepared import prep
+import shapely
 from shapely.strtree import STRtree
+
+from ._aabb import bbox_contains
 from .progress_bar import progress
 
 
@@ -8,17 +11,24 @@ def get_geometries(geometries):
     return getattr(geometries, "geometry", geometries)
 
 
+def get_geometry_array(geometries):
+    return numpy.asarray(get_geometries(geometries))
+
+
 class IndexedGeometries:
     def __init__(self, geometries):
         self.geometries = get_geometries(geometries)
-        for i, geometry in self.geometries.items():
-            geometry.index = i
-        self.spatial_index = STRtree(self.geometries)
+        self._geometry_array = get_geometry_array(self.geometries)
+        # Prepared geometries persist on the shapely objects, so every predicate
+        # evaluated on them from now on can use GEOS's prepared fast paths.
+        shapely.prepare(self._geometry_array)
+        self._bounds = shapely.bounds(self._geometry_array)
+        self.spatial_index = STRtree(self._geometry_array)
         self.index = self.geometries.index
 
     def query(self, geometry):
-        relevant_indices = [geom.index for geom in self.spatial_index.query(geometry)]
-        relevant_geometries = self.geometries.loc[relevant_indices]
+        positions = self.spatial_index.query(geometry)
+        relevant_geometries = self.geometries.iloc[positions]
         return relevant_geometries
 
     def intersections(self, geometry):
@@ -26,21 +36,40 @@ class IndexedGeometries:
         intersections = relevant_geometries.intersection(geometry)
         return intersections[-(intersections.is_empty | intersections.isna())]
 
+    def bounds_for(self, positions):
+        return self._bounds[positions]
+
     def covered_by(self, container):
-        relevant_geometries = self.query(container)
-        prepared_container = prep(container)
-        return relevant_geometries[relevant_geometries.apply(prepared_container.covers)]
+        positions = self.spatial_index.query(container)
+
+        # A geometry can only be covered if its bounding box is, and that is
+        # much cheaper to check than the covers predicate.
+        container_bounds = shapely.bounds(container)[numpy.newaxis, :]
+        positions = positions[
+            bbox_contains(container_bounds, self.bounds_for(positions))
+        ]
+
+        shapely.prepare(container)
+        covered = shapely.covers(container, self._geometry_array[positions])
+        return self.geometries.iloc[positions[covered]]
+
+    def covers_bulk(self, containers):
+        """Returns a pair of integer position arrays ``(containers, geometries)``
+        such that each container covers the corresponding indexed geometry.
+        """
+        return self.spatial_index.query(
+            get_geometry_array(containers), predicate="covers"
+        )
 
     def assign(self, targets):
         target_geometries = get_geometries(targets)
-        groups = [
-            self.covered_by(container).apply(lambda x: container_index)
-            for container_index, container in progress(
-                target_geometries.items(), len(target_geometries)
-            )
-        ]
-        assignment = pandas.concat(groups).reindex(self.index)
-        return assignment
+        target_positions, source_positions = self.covers_bulk(target_geometries)
+        assignment = numpy.empty(len(self.index), dtype=object)
+        assignment[:] = numpy.nan
+        assignment[source_positions] = target_geometries.index.values[target_positions]
+        # Let pandas pick the natural dtype of the labels (float for numbers,
+        # given the NaNs for unassigned geometries).
+        return pandas.Series(assignment, index=self.index).infer_objects()
 
     def enumerate_intersections(self, targets):
         target_geometries = get_geometries(targets)
@@ -1,13 +1,16 @@
+import numpy
 import pandas
-from geopandas import GeoDataFrame
+import shapely
+from geopandas import GeoSeries
 
+from ._aabb import bbox_contains
+from ._parallel import bulk_intersection
 from .crs import require_same_crs
-from .indexed_geometries import IndexedGeometries
-from .indices import get_geometries_with_range_index
+from .indexed_geometries import IndexedGeometries, get_geometry_array
 
 
 @require_same_crs
-def intersections(sources, targets, area_cutoff=None):
+def intersections(sources, targets, area_cutoff=None, n_jobs=None):
     """Computes all of the nonempty intersections between two sets of geometries.
     The returned `~geopandas.GeoSeries` will have a MultiIndex, where the geometry
     at index *(i, j)* is the intersection of ``sources[i]`` and ``targets[j]``
@@ -21,27 +24,145 @@ def intersections(sources, targets, area_cutoff=None):
     :param area_cutoff: (optional) if provided, only return intersections with
         area greater than ``area_cutoff``
     :type area_cutoff: Number or None
+    :param n_jobs: (optional) the number of threads to compute large numbers of
+        intersections on. The default is one per CPU; use ``1`` to compute
+        them all on the calling thread.
+    :type n_jobs: int or None
     """
-    reindexed_sources = get_geometries_with_range_index(sources)
-    reindexed_targets = get_geometries_with_range_index(targets)
-    spatially_indexed_sources = IndexedGeometries(reindexed_sources)
-
-    records = [
-        # Flip i, j to j, i so that the index is ["source", "target"]
-        (sources.index[j], targets.index[i], geometry)
-        for i, j, geometry in spatially_indexed_sources.enumerate_intersections(
-            reindexed_targets
-        )
-    ]
-    df = GeoDataFrame.from_records(records, columns=["source", "target", "geometry"])
-    geometries = df.set_index(["source", "target"]).geometry
-    geometries.sort_index(inplace=True)
-    geometries.crs = sources.crs
+    spatially_indexed_sources = IndexedGeometries(sources)
+    target_positions, source_positions = spatially_indexed_sources.spatial_index.query(
+        get_geometry_array(targets), predicate="intersects"
+    )
+    return intersections_of_pairs(
+        sources,
+        targets,
+        source_positions,
+        target_positions,
+        area_cutoff=area_cutoff,
+        source_bounds=spatially_indexed_sources.bounds_for(source_positions),
+        n_jobs=n_jobs,
+    )
+
+
+@require_same_crs
+def intersections_indexed_by_targets(sources, targets, area_cutoff=None, n_jobs=None):
+    """Computes the same intersections as :func:`intersections`, but queries a
+    spatial index of the targets with the sources instead of the other way
+    around. This is faster when there are few sources and many targets, and
+    lets repeated calls with the same targets share one spatial index.
+    """
+    spatially_indexed_targets = IndexedGeometries(targets)
+    source_positions, target_positions = spatially_indexed_targets.spatial_index.query(
+        get_geometry_array(sources), predicate="intersects"
+    )
+    return intersections_of_pairs(
+        sources,
+        targets,
+        source_positions,
+        target_positions,
+        area_cutoff=area_cutoff,
+        target_bounds=spatially_indexed_targets.bounds_for(target_positions),
+        n_jobs=n_jobs,
+    )
+
 
+def intersections_of_pairs(
+    sources,
+    targets,
+    source_positions,
+    target_positions,
+    area_cutoff=None,
+    source_bounds=None,
+    target_bounds=None,
+    n_jobs=None,
+):
+    geometries = intersect_pairs(
+        get_geometry_array(sources)[source_positions],
+        get_geometry_array(targets)[target_positions],
+        left_bounds=source_bounds,
+        right_bounds=target_bounds,
+        n_jobs=n_jobs,
+    )
+
+    keep = ~(shapely.is_empty(geometries) | shapely.is_missing(geometries))
     if area_cutoff is not None:
-        geometries = geometries[geometries.area > area_cutoff]
+        keep &= shapely.area(geometries) > area_cutoff
+
+    source_positions = source_positions[keep]
+    target_positions = target_positions[keep]
+    geometries = geometries[keep]
+
+    # Sort by source and then target label with one lexsort over integer
+    # ranks, rather than sorting the MultiIndex afterwards.
+    order = numpy.lexsort(
+        (
+            label_ranks(targets.index)[target_positions],
+            label_ranks(sources.index)[source_positions],
+        )
+    )
+    source_positions = source_positions[order]
+    target_positions = target_positions[order]
+    geometries = geometries[order]
+
+    index = pandas.MultiIndex.from_arrays(
+        [
+            sources.index.values[source_positions],
+            targets.index.values[target_positions],
+        ],
+        names=["source", "target"],
+    )
+    return GeoSeries(geometries, index=index, crs=sources.crs)
 
-    return geometries
+
+def label_ranks(index):
+    """Returns the rank of each label of ``index`` in sorted order. Labels of
+    types that can't be compared are still ranked consistently, and missing
+    labels come last, like they do in `sort_index`.
+    """
+    if index.is_monotonic_increasing:
+        return numpy.arange(len(index))
+    codes, uniques = pandas.factorize(index, sort=True)
+    return numpy.where(codes < 0, len(uniques), codes)
+
+
+def intersect_pairs(left, right, left_bounds=None, right_bounds=None, n_jobs=None):
+    """Returns the intersections of two aligned arrays of geometries.
+
+    When one geometry lies in the interior of the other, their intersection is
+    just the inner geometry, so we only compute the (expensive) overlay for the
+    remaining pairs, on ``n_jobs`` threads (see `bulk_intersection`). The
+    bounds of either array may be passed in if they are already known.
+
+    The candidate containers are prepared in place, since the same geometry
+    usually appears in many pairs.
+    """
+    if left_bounds is None:
+        left_bounds = shapely.bounds(left)
+    if right_bounds is None:
+        right_bounds = shapely.bounds(right)
+
+    result = numpy.empty(len(left), dtype=object)
+
+    # Only pairs whose bounding boxes nest can nest themselves.
+    left_contains_right = bbox_contains(left_bounds, right_bounds)
+    shapely.prepare(left[left_contains_right])
+    left_contains_right[left_contains_right] = shapely.contains_properly(
+        left[left_contains_right], right[left_contains_right]
+    )
+    result[left_contains_right] = right[left_contains_right]
+
+    right_contains_left = (
+        bbox_contains(right_bounds, left_bounds) & ~left_contains_right
+    )
+    shapely.prepare(right[right_contains_left])
+    right_contains_left[right_contains_left] = shapely.contains_properly(
+        right[right_contains_left], left[right_contains_left]
+    )
+    result[right_contains_left] = left[right_contains_left]
+
+    rest = ~(left_contains_right | right_contains_left)
+    result[rest] = bulk_intersection(left[rest], right[rest], n_jobs=n_jobs)
+    return result
 
 
 def prorate(relationship, data, weights, aggregate_by="sum"):
@@ -69,14 +190,21 @@ def prorate(relationship, data, weights, aggregate_by="sum"):
     else:
         source_assignment = relationship
 
-    weights = weights.reindex_like(relationship)
+    # Weights computed from the relationship itself (e.g. ``relationship.area``)
+    # already share its index, so there is nothing to align.
+    if weights.index is not relationship.index:
+        weights = weights.reindex(relationship.index, copy=False)
 
     if isinstance(data, pandas.DataFrame):
+        # Line the source rows up with the relationship once, then weight
+        # every column in a single broadcast multiplication.
+        aligned = data.reindex(source_assignment.to_numpy()).to_numpy(
+            dtype=float, na_value=numpy.nan
+        )
         disagreggated = pandas.DataFrame(
-            {
-                column: source_assignment.map(data[column]) * weights
-                for column in data.columns
-            }
+            aligned * weights.to_numpy()[:, numpy.newaxis],
+            index=relationship.index,
+            columns=data.columns,
         )
     elif isinstance(data, pandas.Series):
         disagreggated = source_assignment.map(data) * weights
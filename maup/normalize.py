@@ -1,11 +1,29 @@
-from pandas import Series
+import numpy
+from pandas import MultiIndex, Series, factorize
 
 
 def normalize(weights, level=0):
     """Takes a series of MultiIndexed weights and normalizes them with
     respect to one level (level 0 by default)."""
-    source_assignment = Series(
-        weights.index.get_level_values(level), index=weights.index
-    )
-    denominators = source_assignment.map(weights.groupby(source_assignment).sum())
-    return (weights / denominators).fillna(0)
+    codes = level_codes(weights.index, level)
+    values = weights.to_numpy(dtype=float)
+
+    # Sum the weights in each group and gather the sums back onto the rows,
+    # skipping missing weights just like groupby().sum() does. Rows with a
+    # missing label (code -1) are in no group, and end up as 0.
+    labelled = codes >= 0
+    codes, labelled_values = codes[labelled], values[labelled]
+    totals = numpy.bincount(codes, weights=numpy.nan_to_num(labelled_values, nan=0))
+    normalized = numpy.full(len(values), numpy.nan)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        normalized[labelled] = labelled_values / totals[codes]
+    return Series(normalized, index=weights.index).fillna(0)
+
+
+def level_codes(index, level):
+    if not isinstance(index, MultiIndex):
+        codes, _ = factorize(index.get_level_values(level))
+        return codes
+    if level in index.names:
+        level = index.names.index(level)
+    return index.codes[level]
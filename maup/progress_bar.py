@@ -2,6 +2,12 @@ from tqdm import tqdm
 
 
 class ProgressBar:
+    """Switches the optional progress bars on and off. maup wraps its slow loops
+    (for instance, the chunks of intersections computed by
+    :func:`~maup.intersections`) in a call to the shared ``maup.progress``
+    instance.
+    """
+
     def __init__(self):
         self.enabled = False
         self._previous_value = False
@@ -1,14 +1,17 @@
+import numpy
 import pandas
+import shapely
 
 from geopandas import GeoSeries
 from shapely.geometry import MultiPolygon, Polygon
-from shapely.ops import unary_union
 
+from ._groups import group_bounds
+from ._parallel import thread_map
 from .adjacencies import adjacencies
 from .assign import assign_to_max
 from .crs import require_same_crs
-from .indexed_geometries import get_geometries
-from .intersections import intersections
+from .indexed_geometries import get_geometries, get_geometry_array
+from .intersections import intersections_indexed_by_targets
 
 
 """
@@ -17,36 +20,67 @@ check_shapefile_connectivity.py script in @gerrymandr/Preprocessing.
 """
 
 
-def holes_of_union(geometries):
-    """Returns any holes in the union of the given geometries."""
+POLYGONAL_TYPE_IDS = (shapely.GeometryType.POLYGON, shapely.GeometryType.MULTIPOLYGON)
+
+
+def holes_of_union(geometries, grid_size=None, assume_coverage=False):
+    """Returns any holes in the union of the given geometries.
+
+    If `grid_size` is given, the union snaps all coordinates to a grid of that
+    size. This speeds up the union of geometries with many nearly coincident
+    vertices, and keeps such vertices from leaving tiny artifact holes.
+
+    If `assume_coverage` is True, the geometries are assumed to form a valid
+    coverage (no overlaps, and neighbors share exactly the same vertices along
+    their common edges), which makes the union much faster. The result is
+    undefined if they do not. Snapping to a grid is not supported in this case.
+    """
     geometries = get_geometries(geometries)
-    if not all(
-        isinstance(geometry, (Polygon, MultiPolygon)) for geometry in geometries
-    ):
+    geometry_array = get_geometry_array(geometries)
+    type_ids = shapely.get_type_id(geometry_array)
+    if not numpy.isin(type_ids, POLYGONAL_TYPE_IDS).all():
         raise TypeError("all geometries must be Polygons or MultiPolygons")
 
-    union = unary_union(geometries)
-    series = holes(union)
-    series.crs = geometries.crs
-    return series
+    if assume_coverage:
+        if grid_size is not None:
+            raise ValueError("grid_size cannot be used with assume_coverage")
+        union = shapely.coverage_union_all(geometry_array)
+    else:
+        union = shapely.union_all(geometry_array, grid_size=grid_size)
+    return holes(union, crs=geometries.crs)
 
 
-def holes(geometry):
-    if isinstance(geometry, MultiPolygon):
-        return GeoSeries(
-            [
-                Polygon(list(hole.coords))
-                for polygon in geometry.geoms
-                for hole in polygon.interiors
-            ]
-        )
-    elif isinstance(geometry, Polygon):
-        return GeoSeries([Polygon(list(hole.coords)) for hole in geometry.interiors])
+def holes(geometry, crs=None):
+    return GeoSeries(hole_array(geometry), crs=crs)
+
+
+def hole_array(geometry):
+    """Returns the holes of a Polygon or MultiPolygon as an array of Polygons."""
+    if isinstance(geometry, (Polygon, MultiPolygon)):
+        polygons = shapely.get_parts(geometry)
     else:
         raise TypeError("geometry must be a Polygon or MultiPolygon to have holes")
 
+    counts = shapely.get_num_interior_rings(polygons)
+    if not counts.any():
+        return numpy.empty(0, dtype=object)
 
-def close_gaps(geometries, relative_threshold=0.1):
+    # The k-th hole of the i-th polygon, for every hole
+    owners = numpy.repeat(numpy.arange(len(polygons)), counts)
+    ring_numbers = numpy.arange(len(owners)) - numpy.repeat(
+        numpy.cumsum(counts) - counts, counts
+    )
+    interiors = shapely.get_interior_ring(polygons[owners], ring_numbers)
+    return shapely.polygons(interiors)
+
+
+def close_gaps(
+    geometries,
+    relative_threshold=0.1,
+    grid_size=None,
+    assume_coverage=False,
+    n_jobs=None,
+):
     """Closes gaps between geometries by assigning the hole to the polygon
     that shares the most perimeter with the hole.
 
@@ -55,15 +89,23 @@ def close_gaps(geometries, relative_threshold=0.1):
     of `relative_threshold` is 0.1. This is intended to preserve intentional
     gaps while closing the tiny gaps that can occur as artifacts of
     geospatial operations. Set `relative_threshold=None` to close all gaps.
+
+    The optional `grid_size` and `assume_coverage` are passed on to
+    :func:`holes_of_union` while finding the gaps.
+
+    Large numbers of intersections and unions are computed on `n_jobs` threads
+    (by default, one per CPU). Set `n_jobs=1` to use only the calling thread.
     """
     geometries = get_geometries(geometries)
-    gaps = holes_of_union(geometries)
+    gaps = holes_of_union(
+        geometries, grid_size=grid_size, assume_coverage=assume_coverage
+    )
     return absorb_by_shared_perimeter(
-        gaps, geometries, relative_threshold=relative_threshold
+        gaps, geometries, relative_threshold=relative_threshold, n_jobs=n_jobs
     )
 
 
-def resolve_overlaps(geometries, relative_threshold=0.1):
+def resolve_overlaps(geometries, relative_threshold=0.1, areas=None, n_jobs=None):
     """For any pair of overlapping geometries, assigns the overlapping area to the
     geometry that shares the most perimeter with the overlap. Returns the GeoSeries
     of geometries, which will have no overlaps.
@@ -74,65 +116,154 @@ def resolve_overlaps(geometries, relative_threshold=0.1):
     tiny overlaps that can be safely auto-fixed while preserving major overlaps
     that might indicate deeper issues and should be handled on a case-by-case
     basis. Set `relative_threshold=None` to resolve all overlaps.
+
+    The areas of the geometries, from :func:`compute_areas`, may be passed in
+    as `areas` if they are already known.
+
+    Large numbers of intersections and unions are computed on `n_jobs` threads
+    (by default, one per CPU). Set `n_jobs=1` to use only the calling thread.
     """
     geometries = get_geometries(geometries)
-    inters = adjacencies(geometries, warn_for_islands=False, warn_for_overlaps=False)
-    overlaps = inters[inters.area > 0].buffer(0)
+    inters = adjacencies(
+        geometries, warn_for_islands=False, warn_for_overlaps=False, n_jobs=n_jobs
+    )
+    overlaps = make_valid(inters[inters.area > 0])
 
     if relative_threshold is not None:
-        left_areas, right_areas = split_by_level(geometries.area, overlaps.index)
-        under_threshold = ((overlaps.area / left_areas) < relative_threshold) & (
-            (overlaps.area / right_areas) < relative_threshold
+        if areas is None:
+            areas = compute_areas(geometries)
+        left_areas, right_areas = split_by_level(areas, overlaps.index)
+        overlap_areas = shapely.area(get_geometry_array(overlaps))
+        under_threshold = (overlap_areas < relative_threshold * left_areas) & (
+            overlap_areas < relative_threshold * right_areas
         )
         overlaps = overlaps[under_threshold]
 
     if len(overlaps) == 0:
         return geometries
 
-    to_remove = GeoSeries(
-        pandas.concat([overlaps.droplevel(1), overlaps.droplevel(0)]), crs=overlaps.crs
+    # Each overlap has to be removed from both of the overlapping geometries,
+    # so we take the union of everything to remove from each geometry and then
+    # subtract it in one difference per geometry.
+    overlap_array = get_geometry_array(overlaps)
+    positions, to_remove = union_groups(
+        numpy.concatenate([overlap_array, overlap_array]),
+        numpy.concatenate(
+            [
+                geometries.index.get_indexer(overlaps.index.get_level_values(i))
+                for i in range(2)
+            ]
+        ),
+        n_jobs=n_jobs,
+    )
+    geometry_array = get_geometry_array(geometries).copy()
+    geometry_array[positions] = shapely.difference(geometry_array[positions], to_remove)
+    with_overlaps_removed = GeoSeries(
+        geometry_array, index=geometries.index, crs=geometries.crs
     )
-    with_overlaps_removed = geometries.difference(to_remove)
 
     return absorb_by_shared_perimeter(
-        overlaps, with_overlaps_removed, relative_threshold=None
+        overlaps, with_overlaps_removed, relative_threshold=None, n_jobs=n_jobs
+    )
+
+
+def compute_areas(geometries):
+    """Returns the area of each of the given geometries as a `pandas.Series`,
+    so that it can be computed once and shared between calls.
+    """
+    geometries = get_geometries(geometries)
+    return pandas.Series(
+        shapely.area(get_geometry_array(geometries)), index=geometries.index
     )
 
 
+def make_valid(geometries):
+    """Repairs any invalid geometries in the given `GeoSeries`. Valid
+    geometries are left untouched rather than rebuilt.
+    """
+    geometry_array = get_geometry_array(geometries)
+    invalid = ~shapely.is_valid(geometry_array)
+    if not invalid.any():
+        return geometries
+
+    geometry_array = geometry_array.copy()
+    geometry_array[invalid] = shapely.make_valid(geometry_array[invalid])
+    return GeoSeries(geometry_array, index=geometries.index, crs=geometries.crs)
+
+
 def split_by_level(series, multiindex):
+    """Looks up the value of ``series`` for the labels in each level of
+    ``multiindex``, as one array per level. Labels missing from the index of
+    ``series`` get NaN.
+    """
     return tuple(
-        multiindex.get_level_values(i).to_series(index=multiindex).map(series)
+        series.reindex(multiindex.get_level_values(i)).to_numpy(dtype=float)
         for i in range(multiindex.nlevels)
     )
 
 
 @require_same_crs
-def absorb_by_shared_perimeter(sources, targets, relative_threshold=None):
+def absorb_by_shared_perimeter(sources, targets, relative_threshold=None, n_jobs=None):
     if len(sources) == 0:
         return targets
 
     if len(targets) == 0:
         raise IndexError("targets must be nonempty")
 
-    inters = intersections(sources, targets, area_cutoff=None).buffer(0)
+    inters = make_valid(
+        intersections_indexed_by_targets(
+            sources, targets, area_cutoff=None, n_jobs=n_jobs
+        )
+    )
     assignment = assign_to_max(inters.length)
 
     if relative_threshold is not None:
-        under_threshold = (
-            sources.area / assignment.map(targets.area)
-        ) < relative_threshold
-        assignment = assignment[under_threshold]
+        # Compute each area once and look it up by position
+        source_areas = shapely.area(get_geometry_array(sources))[
+            sources.index.get_indexer(assignment.index)
+        ]
+        target_areas = shapely.area(get_geometry_array(targets))[
+            targets.index.get_indexer(assignment.to_numpy())
+        ]
+        assignment = assignment[source_areas < relative_threshold * target_areas]
 
-    sources_to_absorb = GeoSeries(
-        sources.groupby(assignment).apply(unary_union), crs=sources.crs,
+    labels, sources_to_absorb = union_groups(
+        get_geometry_array(sources)[sources.index.get_indexer(assignment.index)],
+        assignment.to_numpy(),
+        n_jobs=n_jobs,
     )
 
-    result = targets.union(sources_to_absorb)
+    # Only the targets with a source to absorb change; the rest are kept as is.
+    geometry_array = get_geometry_array(targets).copy()
+    absorbing = targets.index.get_indexer(labels)
+    geometry_array[absorbing] = shapely.union(
+        geometry_array[absorbing], sources_to_absorb
+    )
+
+    return GeoSeries(geometry_array, index=targets.index, crs=targets.crs)
+
+
+def union_groups(geoms, labels, n_jobs=None):
+    """Returns the sorted unique ``labels`` and an array of the union of the
+    ``geoms`` with each label. Like `groupby`, geometries with a missing label
+    are left out.
+    """
+    # Sort the geometries by label code, so that each group is a contiguous
+    # slice. Factorizing first lets us sort labels of types that can't be
+    # compared with each other.
+    codes, uniques = pandas.factorize(labels, sort=True)
+    labelled = numpy.flatnonzero(codes >= 0)
+    order = labelled[numpy.argsort(codes[labelled], kind="stable")]
+    geoms = geoms[order]
+    group_codes, starts, stops = group_bounds(codes[order])
+    groups = numpy.asarray(uniques)[group_codes]
 
-    # The .union call only returns the targets who had a corresponding
-    # source to absorb. Now we fill in all of the unchanged targets.
-    result = result.reindex(targets.index)
-    did_not_absorb = result.isna() | result.is_empty
-    result.loc[did_not_absorb] = targets[did_not_absorb]
+    def union_group(bounds):
+        start, stop = bounds
+        if stop - start == 1:
+            return geoms[start]
+        return shapely.union_all(geoms[start:stop])
 
-    return result
+    unions = numpy.empty(len(groups), dtype=object)
+    unions[:] = thread_map(union_group, list(zip(starts, stops)), n_jobs=n_jobs)
+    return groups, unions
@@ -5,7 +5,7 @@ version = "0.6"
 with open("./README.md") as f:
     long_description = f.read()
 
-requirements = ["numpy", "pandas", "geopandas", "shapely", "tqdm"]
+requirements = ["numpy", "pandas", "geopandas", "shapely>=2.0", "tqdm"]
 
 setup(
     name="maup",
@@ -26,6 +26,21 @@ class TestAdjacencies:
         with pytest.warns(IslandWarning):
             adjacencies(four_square_grid.loc[[0, 3]])
 
+    def test_puts_smaller_label_first(self, four_square_grid):
+        geometries = four_square_grid.set_axis([3, 1, 2, 0])
+        adjs = adjacencies(geometries)
+        assert set(adjs.index) == {(1, 3), (2, 3), (0, 1), (0, 2)}
+
+    def test_checks_for_islands_with_mixed_type_index(self, four_square_grid):
+        geometries = four_square_grid.set_axis([0, "b", 2, "d"])
+        adjs = adjacencies(geometries)
+        assert set(adjs.index) == {(0, "b"), (0, 2), ("b", "d"), (2, "d")}
+
+    def test_returns_empty_when_no_adjacencies(self, four_square_grid):
+        with pytest.warns(IslandWarning):
+            adjs = adjacencies(four_square_grid.loc[[0, 3]], "rook")
+        assert len(adjs) == 0
+
     def test_returns_geometries(self, four_square_grid):
         adjs = adjacencies(four_square_grid)
         assert len(adjs.length) == 4
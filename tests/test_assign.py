@@ -2,7 +2,7 @@ import pandas
 from numpy import nan
 
 from maup import assign
-from maup.assign import assign_by_area, assign_by_covering
+from maup.assign import assign_by_area, assign_by_covering, assign_to_max
 
 
 def test_assign_assigns_geometries_when_they_nest_neatly(
@@ -137,3 +137,31 @@ def test_assign_dispatches_to_without_area_and_with_area(
     )
 
     assert (expected == assignment).all()
+
+
+def test_assign_to_max_picks_first_maximum_for_each_source():
+    index = pandas.MultiIndex.from_tuples(
+        [(2, "x"), (1, "y"), (1, "z"), (2, "y")], names=["source", "target"]
+    )
+    weights = pandas.Series([1, 2, 2, 3], index=index)
+    expected = pandas.Series(["y", "y"], index=[1, 2])
+    assert (assign_to_max(weights) == expected).all()
+
+
+def test_assign_to_max_picks_first_maximum_when_sources_are_sorted():
+    index = pandas.MultiIndex.from_tuples(
+        [(1, "x"), (1, "y"), (1, "z"), (2, "x"), (2, "y")], names=["source", "target"]
+    )
+    weights = pandas.Series([1, 3, 3, 2, 1], index=index)
+    expected = pandas.Series(["y", "x"], index=[1, 2])
+    assert (assign_to_max(weights) == expected).all()
+
+
+def test_assign_to_max_leaves_out_missing_source_labels():
+    index = pandas.MultiIndex.from_tuples(
+        [(nan, "x"), ("a", "x"), ("a", "y")], names=["source", "target"]
+    )
+    weights = pandas.Series([3, 1, 2], index=index)
+    expected = pandas.Series(["y"], index=["a"])
+    assert (assign_to_max(weights) == expected).all()
+    assert len(assign_to_max(weights)) == 1
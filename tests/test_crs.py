@@ -1,10 +1,11 @@
+from geopandas import GeoSeries
 from maup.crs import require_same_crs
 import pytest
 
 
 def test_require_same_crs(square, four_square_grid):
-    square.crs = "foo"
-    four_square_grid.crs = "bar"
+    square = GeoSeries([square], crs="EPSG:4326")
+    four_square_grid = four_square_grid.set_crs("EPSG:3857", allow_override=True)
 
     @require_same_crs
     def f(sources, targets):
@@ -0,0 +1,15 @@
+import numpy
+
+from maup._groups import group_bounds
+
+
+def test_group_bounds_finds_each_run_of_labels():
+    labels, starts, stops = group_bounds(numpy.array(["a", "a", "b", "c", "c", "c"]))
+    assert list(labels) == ["a", "b", "c"]
+    assert list(starts) == [0, 2, 3]
+    assert list(stops) == [2, 3, 6]
+
+
+def test_group_bounds_handles_empty_input():
+    labels, starts, stops = group_bounds(numpy.array([], dtype=object))
+    assert len(labels) == len(starts) == len(stops) == 0
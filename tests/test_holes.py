@@ -1,16 +1,20 @@
 from itertools import product
 
 import geopandas
+import numpy
+import pandas
 import pytest
 from shapely.geometry import Point, Polygon
 
 from maup.repair import (
     close_gaps,
+    compute_areas,
     holes,
     holes_of_union,
     absorb_by_shared_perimeter,
     resolve_overlaps,
     adjacencies,
+    union_groups,
 )
 
 
@@ -92,11 +96,60 @@ class TestHoles:
             result[1].equals(squares[0]) and result[0].equals(squares[1])
         )
 
+    def test_grid_size_snaps_away_tiny_holes(self):
+        eps = 1e-7
+        geometries = geopandas.GeoSeries(
+            [
+                square_at(point)
+                for point in product([0, 1, 2], [0, 1, 2])
+                if point != (1, 1)
+            ]
+            + [square_at((1 + eps, 1 + eps), side_length=1 - 2 * eps)]
+        )
+        assert len(holes_of_union(geometries)) == 1
+        assert len(holes_of_union(geometries, grid_size=1e-3)) == 0
+
+    def test_assume_coverage_finds_the_same_holes(self):
+        geometries = geopandas.GeoSeries(
+            [
+                square_at(point)
+                for point in product([0, 1, 2, 3, 4], [0, 1, 2])
+                if point not in [(1, 1), (3, 1)]
+            ]
+        )
+        expected = holes_of_union(geometries)
+        result = holes_of_union(geometries, assume_coverage=True)
+        assert len(result) == len(expected)
+        assert result.unary_union.equals(expected.unary_union)
+
+    def test_assume_coverage_cannot_snap_to_grid(self):
+        geometries = geopandas.GeoSeries([square_at((0, 0))])
+        with pytest.raises(ValueError):
+            holes_of_union(geometries, grid_size=1e-3, assume_coverage=True)
+
+    def test_keeps_crs_of_geometries(self):
+        geometries = geopandas.GeoSeries(
+            [
+                square_at(point)
+                for point in product([0, 1, 2], [0, 1, 2])
+                if point != (1, 1)
+            ],
+            crs="EPSG:4326",
+        )
+        assert holes_of_union(geometries).crs == geometries.crs
+        assert holes_of_union(geometries.iloc[:1]).crs == geometries.crs
+
     def test_raises_for_non_polygons(self):
         has_a_point = geopandas.GeoSeries([Point((0, 0)), square_at((0, 0))])
         with pytest.raises(TypeError):
             holes_of_union(has_a_point)
 
+    def test_holes_uses_given_crs(self):
+        geometry = Polygon(
+            [(0, 0), (3, 0), (3, 3), (0, 3)], holes=[square_at((1, 1)).exterior.coords]
+        )
+        assert holes(geometry, crs="EPSG:4326").crs == "EPSG:4326"
+
     def test_holes_raises_for_non_polygon(self):
         with pytest.raises(TypeError):
             holes(Point(0, 0))
@@ -140,6 +193,20 @@ class TestFixGaps:
         assert fixed[1].equals(bar)
         assert fixed[0].equals(Polygon([(0, 0), (0, 3), (2, 3), (2, 0)]))
 
+    def test_assigns_gap_to_geometry_sharing_most_perimeter(self):
+        # 011
+        # 0 1
+        # 011
+        bar = Polygon([(0, 0), (0, 3), (1, 3), (1, 0)])
+        pacman = Polygon(
+            [(1, 0), (3, 0), (3, 3), (1, 3), (1, 2), (2, 2), (2, 1), (1, 1)]
+        )
+
+        geometries = geopandas.GeoSeries([bar, pacman])
+        fixed = close_gaps(geometries, relative_threshold=None)
+        assert fixed[0].equals(bar)
+        assert fixed[1].equals(Polygon([(1, 0), (3, 0), (3, 3), (1, 3)]))
+
 
 class TestAbsorbBySharedPerimeters:
     def test_returns_targets_if_sources_empty(self):
@@ -159,6 +226,51 @@ class TestAbsorbBySharedPerimeters:
         with pytest.raises(IndexError):
             absorb_by_shared_perimeter(sources, targets)
 
+    def test_unions_every_source_into_its_target(self):
+        # b
+        # xa y
+        targets = geopandas.GeoSeries(
+            [square_at((0, 0)), square_at((3, 0))], index=["x", "y"], crs="EPSG:4326"
+        )
+        sources = geopandas.GeoSeries(
+            [square_at((1, 0)), square_at((0, 1))], crs="EPSG:4326"
+        )
+
+        result = absorb_by_shared_perimeter(sources, targets)
+
+        assert list(result.index) == ["x", "y"]
+        assert result.crs == targets.crs
+        assert result["x"].equals(
+            Polygon([(0, 0), (2, 0), (2, 1), (1, 1), (1, 2), (0, 2)])
+        )
+        assert result["y"] is targets["y"]
+
+
+class TestUnionGroups:
+    def test_unions_geometries_with_the_same_label(self):
+        geoms = numpy.array(
+            [square_at((1, 0)), square_at((5, 5)), square_at((0, 0))], dtype=object
+        )
+        labels = numpy.array(["b", "a", "b"], dtype=object)
+
+        groups, unions = union_groups(geoms, labels)
+
+        assert list(groups) == ["a", "b"]
+        assert unions[0].equals(square_at((5, 5)))
+        assert unions[1].equals(Polygon([(0, 0), (2, 0), (2, 1), (0, 1)]))
+
+    def test_groups_labels_of_mixed_types(self):
+        geoms = numpy.array(
+            [square_at((1, 0)), square_at((5, 5)), square_at((0, 0))], dtype=object
+        )
+        labels = numpy.array([0, "b", 0], dtype=object)
+
+        groups, unions = union_groups(geoms, labels)
+
+        assert list(groups) == [0, "b"]
+        assert unions[0].equals(Polygon([(0, 0), (2, 0), (2, 1), (0, 1)]))
+        assert unions[1].equals(square_at((5, 5)))
+
 
 class TestResolveOverlaps:
     def test_removes_overlaps(self):
@@ -213,6 +325,35 @@ class TestResolveOverlaps:
         assert result[0].equals(square1)
         assert result[1].equals(square2)
 
+    def test_uses_given_areas_for_threshold(self):
+        # 000
+        # 00x1
+        # 00x1
+        square1 = square_at((0, 0), side_length=3)
+        square2 = square_at((2, 0), side_length=2)
+        geometries = geopandas.GeoSeries([square1, square2])
+        areas = compute_areas(geometries)
+        assert list(areas) == [9, 4]
+
+        # Pretending the squares are much bigger brings the overlap under the
+        # threshold, so it gets resolved.
+        result = resolve_overlaps(geometries, relative_threshold=0.4, areas=areas * 10)
+        assert result[1].equals(Polygon([(3, 0), (3, 2), (4, 2), (4, 0)]))
+
+    def test_overlap_with_missing_area_is_left_alone(self):
+        # 000
+        # 00x1
+        # 00x1
+        square1 = square_at((0, 0), side_length=3)
+        square2 = square_at((2, 0), side_length=2)
+        geometries = geopandas.GeoSeries([square1, square2], index=["a", "b"])
+        areas = pandas.Series([9.0, 1000.0], index=["a", "zzz"])
+
+        result = resolve_overlaps(geometries, relative_threshold=0.4, areas=areas)
+
+        assert result["a"].equals(square1)
+        assert result["b"].equals(square2)
+
     def test_threshold_rules_out_one_but_not_both(self):
         # 000
         # 00x1
@@ -230,3 +371,17 @@ class TestResolveOverlaps:
         # 00x1
         assert result[0].equals(square1)
         assert result[1].equals(square2)
+
+    def test_removes_every_overlap_from_a_geometry(self):
+        # 0x1x2
+        # 0x1x2
+        # 0x1x2
+        geometries = geopandas.GeoSeries(
+            [square_at((x, 0), side_length=3) for x in (0, 2, 4)],
+            index=["a", "b", "c"],
+        )
+        result = resolve_overlaps(geometries, relative_threshold=None)
+
+        assert list(result.index) == ["a", "b", "c"]
+        assert not (adjacencies(result).area > 0).any()
+        assert result.unary_union.equals(geometries.unary_union)
@@ -1,5 +1,6 @@
 from unittest.mock import patch
 
+import shapely
 from geopandas import GeoSeries
 from shapely import wkt
 
@@ -46,10 +47,10 @@ def test_intersections_correct_when_all_overlapping(four_square_grid, square):
     ]
 
     for p in expected_polygons:
-        assert any(overlap == p for overlap in overlaps)
+        assert any(overlap.equals(p) for overlap in overlaps)
 
     for p in overlaps:
-        assert any(p == expected for expected in expected_polygons)
+        assert any(p.equals(expected) for expected in expected_polygons)
 
 
 def test_returns_empty_when_no_overlaps(four_square_grid, distant_polygon):
@@ -75,3 +76,16 @@ def test_covered_by_method_returns_empty_when_not_covered_by_any(
     indexed = IndexedGeometries(four_square_grid)
     covered = indexed.covered_by(square)
     assert len(covered) == 0
+
+
+def test_covered_by_method_returns_covered_geometries(
+    four_square_grid, squares_within_four_square_grid
+):
+    indexed = IndexedGeometries(squares_within_four_square_grid)
+    covered = indexed.covered_by(four_square_grid.geometry[0])
+    assert set(covered.index) == {0, 1}
+
+
+def test_indexed_geometries_are_prepared(four_square_grid):
+    indexed = IndexedGeometries(four_square_grid)
+    assert shapely.is_prepared(indexed._geometry_array).all()
@@ -1,8 +1,11 @@
+from importlib import import_module
+
 import geopandas
 import pandas
 import pytest
+import shapely
 
-from maup.intersections import intersections
+from maup.intersections import intersections, intersections_indexed_by_targets
 
 
 @pytest.fixture
@@ -40,7 +43,7 @@ class TestIntersections:
     def test_expected_intersections(self, sources, targets_with_str_index):
         expected = manually_compute_intersections(sources, targets_with_str_index)
         result = intersections(sources, targets_with_str_index)
-        assert (result == expected).all()
+        assert result.geom_equals(expected).all()
 
     def test_gives_expected_index(self, sources, targets_with_str_index):
         expected = manually_compute_intersections(sources, targets_with_str_index)
@@ -48,6 +51,56 @@ class TestIntersections:
         they_match = result.index == expected.index
         assert they_match.all()
 
+    def test_returns_source_unchanged_when_inside_target(
+        self, sources, targets_with_str_index
+    ):
+        # sources[3] lies in the interior of target "d"
+        result = intersections(sources, targets_with_str_index)
+        assert result[(3, "d")] is sources[3]
+
+    def test_works_with_mixed_and_missing_labels(self, sources, targets_with_str_index):
+        labels = {"a": 0, "b": "b", "c": None, "d": "d"}
+        targets = targets_with_str_index.rename(index=labels)
+        expected = intersections(sources, targets_with_str_index)
+
+        result = intersections(sources, targets)
+
+        def pairs(index):
+            return {
+                (source, "missing" if pandas.isna(target) else target)
+                for source, target in index
+            }
+
+        assert pairs(result.index) == pairs(
+            (source, labels[target]) for source, target in expected.index
+        )
+        assert result.area.sum() == expected.area.sum()
+
+    def test_returns_target_unchanged_when_inside_source(
+        self, sources, targets_with_str_index
+    ):
+        # sources[3] lies in the interior of "d", which is the source here
+        result = intersections(targets_with_str_index, sources)
+        assert result[("d", 3)] is sources[3]
+
+    def test_passes_n_jobs_on_to_bulk_intersection(self, sources, targets, monkeypatch):
+        calls = []
+
+        def bulk_intersection(left, right, n_jobs=None):
+            calls.append(n_jobs)
+            return shapely.intersection(left, right)
+
+        module = import_module("maup.intersections")
+        monkeypatch.setattr(module, "bulk_intersection", bulk_intersection)
+        intersections(sources, targets, n_jobs=1)
+        assert calls == [1]
+
+    def test_indexing_targets_gives_same_result(self, sources, targets_with_str_index):
+        expected = intersections(sources, targets_with_str_index)
+        result = intersections_indexed_by_targets(sources, targets_with_str_index)
+        assert (result.index == expected.index).all()
+        assert result.geom_equals(expected).all()
+
     def test_is_a_top_level_import(self):
         from maup import intersections
 
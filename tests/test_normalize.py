@@ -9,3 +9,25 @@ def test_normalize():
     weights = pandas.Series([10, 20, 25, 15, 0, 30], index=index)
     expected = pandas.Series([1 / 3, 2 / 3, 25 / 40, 15 / 40, 0, 1], index=index)
     assert (maup.normalize(weights) == expected).all(0)
+
+
+def test_normalize_by_named_level():
+    index = pandas.MultiIndex.from_tuples(
+        [(0, 1), (0, 2), (1, 2), (1, 3)], names=["source", "target"]
+    )
+    weights = pandas.Series([10, 20, 20, 15], index=index)
+    expected = pandas.Series([1, 1 / 2, 1 / 2, 1], index=index)
+    assert (maup.normalize(weights, level="target") == expected).all()
+
+
+def test_normalize_with_flat_index():
+    weights = pandas.Series([10, 20, 0], index=[(0, 1), (0, 2), (1, 2)])
+    expected = pandas.Series([1, 1, 0], index=weights.index)
+    assert (maup.normalize(weights) == expected).all()
+
+
+def test_normalize_gives_zero_for_missing_labels():
+    index = pandas.MultiIndex.from_tuples([(0, 1), (0, 2), (float("nan"), 2)])
+    weights = pandas.Series([10, 30, 5], index=index)
+    expected = pandas.Series([1 / 4, 3 / 4, 0], index=index)
+    assert (maup.normalize(weights) == expected).all()
@@ -0,0 +1,47 @@
+import shapely
+from shapely.geometry import box
+
+import maup._parallel
+from maup import progress
+from maup._parallel import bulk_intersection, thread_map
+
+
+def test_bulk_intersection_matches_serial_intersection():
+    left = [box(i, 0, i + 2, 2) for i in range(10)]
+    right = [box(i + 1, 1, i + 3, 3) for i in range(10)]
+    expected = shapely.intersection(left, right)
+
+    result = bulk_intersection(left, right, n_jobs=3, chunksize=4)
+
+    assert len(result) == len(expected)
+    assert shapely.equals(result, expected).all()
+
+
+def test_bulk_intersection_handles_empty_input():
+    assert len(bulk_intersection([], [], n_jobs=2, chunksize=1)) == 0
+
+
+def test_thread_map_preserves_order():
+    items = list(range(20))
+    assert thread_map(lambda item: item * 2, items, n_jobs=4, min_items=1) == [
+        item * 2 for item in items
+    ]
+
+
+def test_thread_map_runs_small_inputs_on_the_calling_thread(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("should not start a thread pool")
+
+    monkeypatch.setattr(maup._parallel, "ThreadPoolExecutor", no_pool)
+    assert thread_map(lambda item: item * 2, [1, 2, 3], n_jobs=4) == [2, 4, 6]
+
+
+def test_bulk_intersection_shows_progress_when_enabled(capsys):
+    left = [box(i, 0, i + 2, 2) for i in range(10)]
+    right = [box(i + 1, 1, i + 3, 3) for i in range(10)]
+
+    with progress():
+        result = bulk_intersection(left, right, n_jobs=1, chunksize=4)
+
+    assert shapely.equals(result, shapely.intersection(left, right)).all()
+    assert "3/3" in capsys.readouterr().err
@@ -97,3 +97,16 @@ def test_trivial_case(sources):
     weights = pandas.Series([1] * len(pieces), index=pieces.index)
     prorated = prorate(pieces, sources[columns], weights)
     assert (prorated == sources[columns]).all().all()
+
+
+def test_prorate_dataframe_with_nullable_column():
+    index = pandas.MultiIndex.from_tuples(
+        [(0, "x"), (1, "x")], names=["source", "target"]
+    )
+    relationship = pandas.Series([1, 1], index=index)
+    data = pandas.DataFrame({"data": pandas.array([1, None], dtype="Int64")})
+    weights = pandas.Series([0.5, 0.5], index=index)
+
+    prorated = prorate(relationship, data, weights)
+
+    assert prorated.loc["x", "data"] == 0.5